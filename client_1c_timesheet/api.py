@@ -1,13 +1,37 @@
 """Models the 1C OData API. Tries to stay close to the actual endpoints.
 This layer is the only one that should do actual http queries
 """
+import codecs
+from concurrent.futures import ThreadPoolExecutor
 from json.decoder import JSONDecodeError
-from typing import Type, List, Dict
+from threading import Lock
+from time import monotonic, sleep
+from typing import Type, List, Dict, Union
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from client_1c_timesheet.decorators import except_connection_error
 from client_1c_timesheet.exceptions import Client1CException
 
+try:
+    import orjson
+    _loads = orjson.loads
+    _dumps = orjson.dumps
+except ImportError:  # orjson is optional, fall back to the standard library
+    import json
+    _loads = json.loads
+
+    def _dumps(obj):
+        return json.dumps(obj).encode('utf-8')
+
+try:
+    import ijson
+except ImportError:  # ijson is optional, without it iter_get reads the whole response at once
+    ijson = None
+
+_JSON_BODY_HEADERS = {'Content-Type': 'application/json'}  # for requests with a body only, not for GET
+
 
 class APIServer:
     """Models a clockify API server. Basic HTTP interaction. Returns json and raises exceptions
@@ -27,6 +51,31 @@ class APIServer:
             url of the api
         """
         self.url = url
+        self._session = requests.Session()
+        self._session.params = {"$format": "json"}
+        self._session.headers.update({'Accept': 'application/json'})
+        # POST is not retried: it creates a document in 1C and a retry might create it twice
+        adapter = HTTPAdapter(pool_connections=self.RATE_LIMIT_REQUESTS_PER_SECOND,
+                              pool_maxsize=self.RATE_LIMIT_REQUESTS_PER_SECOND * 2,
+                              max_retries=Retry(total=3, backoff_factor=0.2, status_forcelist=(429, 502, 503, 504),
+                                                allowed_methods=frozenset(['GET', 'PUT', 'PATCH']),
+                                                raise_on_status=False))
+        self._session.mount('http://', adapter)
+        self._session.mount('https://', adapter)
+        self._executor = ThreadPoolExecutor(max_workers=self.RATE_LIMIT_REQUESTS_PER_SECOND)
+        self._rate_lock = Lock()
+        self._next_request_time = monotonic()
+
+    def close(self):
+        """Release pooled connections of the underlying http session and stop bulk workers"""
+        self._executor.shutdown(wait=True)
+        self._session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
 
     @except_connection_error
     def get(self, path: str, auth: (str, str), params: dict = None):
@@ -47,18 +96,14 @@ class APIServer:
             Json-interpreted response from server
 
         """
-        if params:
-            params = params | {"$format": "json"}
-        else:
-            params = {"$format": "json"}
-        response_raw = requests.get(
+        response_raw = self._session.get(
             self.url + path,
             auth=auth,
             params=params)
         return APIRawResponse(response_raw).parse()
 
     @except_connection_error
-    def post(self, path: str, auth: (str, str), data: dict):
+    def post(self, path: str, auth: (str, str), data: Union[dict, bytes]):
         """
 
 
@@ -68,8 +113,8 @@ class APIServer:
             relative path to endpoint. Like '/user' or '/workspaces'
         auth: (str, str)
             basic auth: user and pass to send with request
-        data: Dict
-            data to send as json
+        data: Dict or bytes
+            data to send as json, or a body already encoded by encode_json
 
         Returns
         -------
@@ -77,16 +122,16 @@ class APIServer:
             Json-interpreted response from server
 
         """
-        response_raw = requests.post(
+        response_raw = self._session.post(
             self.url + path,
             auth=auth,
-            params={"$format": "json"},
-            json=data
+            data=self.encode_json(data),
+            headers=_JSON_BODY_HEADERS
         )
         return APIRawResponse(response_raw).parse()
 
     @except_connection_error
-    def put(self, path: str, auth: (str, str), data: dict):
+    def put(self, path: str, auth: (str, str), data: Union[dict, bytes]):
         """
 
         Parameters
@@ -95,8 +140,8 @@ class APIServer:
             relative path to endpoint. Like '/user' or '/workspaces'
         auth: (str, str)
             basic auth: user and pass to send with request
-        data: Dict
-            data to send as json
+        data: Dict or bytes
+            data to send as json, or a body already encoded by encode_json
 
         Returns
         -------
@@ -104,16 +149,16 @@ class APIServer:
             Json-interpreted response from server
 
         """
-        response_raw = requests.put(
+        response_raw = self._session.put(
             self.url + path,
             auth=auth,
-            params={"$format": "json"},
-            json=data
+            data=self.encode_json(data),
+            headers=_JSON_BODY_HEADERS
         )
         return APIRawResponse(response_raw).parse()
 
     @except_connection_error
-    def patch(self, path: str, auth: tuple[str, str], data: dict):
+    def patch(self, path: str, auth: tuple[str, str], data: Union[dict, bytes]):
         """
 
         Parameters
@@ -122,8 +167,8 @@ class APIServer:
             relative path to endpoint. Like '/user' or '/workspaces'
         auth: (str, str)
             basic auth: user and pass to send with request
-        data: dict
-            data to send as json
+        data: Dict or bytes
+            data to send as json, or a body already encoded by encode_json
 
         Returns
         -------
@@ -131,14 +176,145 @@ class APIServer:
             Json-interpreted response from server
 
         """
-        response_raw = requests.patch(
+        response_raw = self._session.patch(
             self.url + path,
             auth=auth,
-            params={"$format": "json"},
-            json=data
+            data=self.encode_json(data),
+            headers=_JSON_BODY_HEADERS
         )
         return APIRawResponse(response_raw).parse()
 
+    def iter_get(self, path: str, auth: (str, str), params: dict = None):
+        """Like get, but yields items of the 'value' list one by one while the response is being received.
+        Use for large collections. If ijson is not installed, reads the whole response first
+
+        The request is sent when iteration starts. The connection is returned to the pool when the iterator
+        is exhausted, closed or garbage collected
+
+        Parameters
+        ----------
+        path: str
+            relative path to endpoint. Like 'Document_ТабельУчетаРабочегоВремени'
+        auth: (str, str)
+            basic auth: user and pass to send with request
+        params: Dict, optional
+            Request parameters to send. Defaults to empty list
+
+        Returns
+        -------
+        Iterator[Dict]:
+            Json-interpreted items of the collection
+
+        """
+        try:
+            response_raw = self._session.get(
+                self.url + path,
+                auth=auth,
+                params=params,
+                stream=ijson is not None)
+            with response_raw:
+                if response_raw.status_code not in (200, 201):
+                    APIRawResponse(response_raw).parse()  # raises the api error
+                if ijson is None:
+                    yield from APIRawResponse(response_raw).get_json().get('value', ())
+                else:
+                    yield from self._iter_items(response_raw)
+        except requests.exceptions.ConnectionError as e:
+            raise Client1CException(f'Requests connection error: {e}')
+
+    @staticmethod
+    def _iter_items(response_raw):
+        """Generator of items from the 'value' list of a streamed response"""
+        items = ijson.sendable_list()
+        parser = ijson.items_coro(items, 'value.item', use_float=True)
+        try:
+            first_chunk = True
+            for chunk in response_raw.iter_content(chunk_size=64 * 1024):
+                if first_chunk and chunk.startswith(codecs.BOM_UTF8):  # 1C may prepend BOM to json
+                    chunk = chunk[len(codecs.BOM_UTF8):]
+                first_chunk = False
+                parser.send(chunk)
+                yield from items
+                del items[:]
+            parser.close()
+        except ijson.JSONError as e:
+            raise APIResponseParseException(f"Could not parse response as JSON: '{e}'")
+        yield from items
+
+    @staticmethod
+    def encode_json(data) -> bytes:
+        """Encode data as json request body. Encode once and pass the bytes to post/put/patch to reuse a body
+
+        Parameters
+        ----------
+        data: Dict or bytes
+            data to encode. Bytes are considered already encoded and returned as is
+
+        Returns
+        -------
+        bytes
+            json encoded body
+
+        """
+        if isinstance(data, bytes):
+            return data
+        return _dumps(data)
+
+    def bulk_get(self, paths_params: List[tuple], auth: (str, str)) -> list:
+        """Send several independent GET requests concurrently over the shared session
+
+        Parameters
+        ----------
+        paths_params: List[(str, dict)]
+            pairs of relative path to endpoint and request parameters (might be None)
+        auth: (str, str)
+            basic auth: user and pass to send with requests
+
+        Returns
+        -------
+        List:
+            Json-interpreted responses from server, in the order of paths_params
+
+        """
+        futures = [self._executor.submit(self._rate_limited, self.get, path=path, auth=auth, params=params)
+                   for path, params in paths_params]
+        return [future.result() for future in futures]
+
+    def bulk_post(self, path: str, auth: (str, str), data_list: List[Union[dict, bytes]]) -> list:
+        """Send several independent POST requests to one endpoint concurrently over the shared session
+
+        Parameters
+        ----------
+        path: str
+            relative path to endpoint. Like 'Document_ТабельУчетаРабочегоВремени'
+        auth: (str, str)
+            basic auth: user and pass to send with requests
+        data_list: List[Union[dict, bytes]]
+            data to send as json or bodies already encoded by encode_json, one item per request
+
+        Returns
+        -------
+        List:
+            Json-interpreted responses from server, in the order of data_list
+
+        """
+        futures = [self._executor.submit(self._rate_limited, self.post, path=path, auth=auth, data=data)
+                   for data in data_list]
+        return [future.result() for future in futures]
+
+    def _rate_limited(self, func, **kwargs):
+        """Call func no sooner than allowed by RATE_LIMIT_REQUESTS_PER_SECOND, shared by all bulk workers"""
+        with self._rate_lock:
+            now = monotonic()
+            wait = self._next_request_time - now
+            self._next_request_time = max(now, self._next_request_time) + 1 / self.RATE_LIMIT_REQUESTS_PER_SECOND
+        if wait > 0:
+            sleep(wait)
+        return func(**kwargs)
+
+
+_NOT_PARSED = object()  # sentinel, parsed json might be any value including None
+
 
 class APIRawResponse:
 
@@ -150,6 +326,7 @@ class APIRawResponse:
         raw_response: requests response
         """
         self.raw_response = raw_response
+        self._parsed = _NOT_PARSED
 
     def parse(self) -> dict:
         """Return API response as dict. If the response encodes an API error, raise Exception
@@ -169,11 +346,9 @@ class APIRawResponse:
             The parsed response
 
         """
-        if self.raw_response.status_code in [200, 201]:
-            if 'value' in self.parse_json(self.raw_response).keys():
-                return self.parse_json(self.raw_response)['value']
-            else:
-                return self.parse_json(self.raw_response)
+        if self.raw_response.status_code in (200, 201):
+            body = self.get_json()
+            return body['value'] if 'value' in body else body
         else:
             error_response = self.parse_json_clockify_error(self.raw_response)
             msg = f"HTTP {self.raw_response.status_code} containing API error '{self.raw_response.text}'"
@@ -182,6 +357,24 @@ class APIRawResponse:
             else:
                 raise APIServerException(msg, error_response=error_response)
 
+    def get_json(self) -> dict:
+        """Parsed json of the raw response, decoded only once per instance
+
+        Raises
+        ------
+        APIResponseParseException
+            When response text cannot be parsed as json
+
+        Returns
+        -------
+        Dict
+            Parsed json
+
+        """
+        if self._parsed is _NOT_PARSED:
+            self._parsed = self.parse_json(self.raw_response)
+        return self._parsed
+
     @staticmethod
     def parse_json(response) -> dict:
         """Parse response json string from server into object
@@ -202,9 +395,12 @@ class APIRawResponse:
             Parsed json
 
         """
+        content = response.content
+        if content.startswith(codecs.BOM_UTF8):  # 1C may prepend BOM to json
+            content = content[len(codecs.BOM_UTF8):]
         try:
-            return response.json()
-        except JSONDecodeError:
+            return _loads(content)
+        except (JSONDecodeError, UnicodeDecodeError):  # json.loads does not wrap invalid utf-8
             msg = f"Could not parse response as JSON: '{response.text}'"
             raise APIResponseParseException(msg)
 
@@ -225,7 +421,7 @@ class APIRawResponse:
         -------
         APIErrorResponse
         """
-        parsed = self.parse_json(error_text)
+        parsed = self.get_json() if error_text is self.raw_response else self.parse_json(error_text)
         # 1C api odata errors use 'message' for human readable component.
         if 'odata.error' in parsed.keys():
             if 'message' in parsed['odata.error'].keys() and 'value' in parsed['odata.error']['message']:
@@ -4,7 +4,7 @@ from client_1c_timesheet.api import APIServer, APIServer404
 from client_1c_timesheet.decorators import request_rate_watchdog
 from client_1c_timesheet.models import TimeGroup, Organization, Employee, TimeSheetLine, TimeSheetRecord, TimeSheet
 from functools import lru_cache
-from typing import List, Dict
+from typing import List, Dict, Iterator
 
 class APISession:
     """Models the interaction of one user with one workspace. Caches current user, workspace and projects.
@@ -54,6 +54,16 @@ class APISession:
     def get_time_sheets(self) -> List[TimeSheet]:
         return self.api.get_time_sheets(auth=self.auth)
 
+    @request_rate_watchdog(APIServer.RATE_LIMIT_REQUESTS_PER_SECOND)
+    def iter_time_sheet_lines(self) -> Iterator[TimeSheetLine]:
+        """Not cached, streams the time sheet lines, see API1C.iter_time_sheet_lines"""
+        return self.api.iter_time_sheet_lines(auth=self.auth)
+
+    @request_rate_watchdog(APIServer.RATE_LIMIT_REQUESTS_PER_SECOND)
+    def iter_time_sheets(self) -> Iterator[TimeSheet]:
+        """Not cached, streams the time sheets, see API1C.iter_time_sheets"""
+        return self.api.iter_time_sheets(auth=self.auth)
+
     @request_rate_watchdog(APIServer.RATE_LIMIT_REQUESTS_PER_SECOND)
     def add_time_sheet(self, time_sheet: TimeSheet) -> TimeSheet:
         """Add the given time sheet document to 1C
@@ -71,6 +81,22 @@ class APISession:
         """
         return self.api.add_time_sheet(auth=self.auth, time_sheet=time_sheet)
 
+    def add_time_sheets(self, time_sheets: List[TimeSheet]) -> List[bool]:
+        """Add the given time sheet documents to 1C concurrently. Rate limit is maintained by APIServer
+
+        Parameters
+        ----------
+        time_sheets: List[TimeSheet]
+            The time sheets to add
+
+        Returns
+        -------
+        List[bool]
+            One result per added time sheet
+
+        """
+        return self.api.add_time_sheets(auth=self.auth, time_sheets=time_sheets)
+
 '''@request_rate_watchdog(APIServer.RATE_LIMIT_REQUESTS_PER_SECOND)
     def make_workspace(self, workspace_name: str) -> Workspace:
         return self.api.make_workspace(api_key=self.api_key, workspace_name=workspace_name)
@@ -334,6 +360,36 @@ class API1C:
         response = self.api_server.get(path="Document_ТабельУчетаРабочегоВремени", auth=auth)
         return [TimeSheet.init_from_dict(x) for x in response]
 
+    def iter_time_sheet_lines(self, auth) -> Iterator[TimeSheetLine]:
+        """Iterate over all time sheet lines from documents time sheet for the given account. Lines are parsed
+        while the response is being received, so the whole response is not kept in memory
+
+        Parameters
+        ----------
+        auth: (str, str)
+            1C basic auth
+
+        Returns
+        -------
+        Iterator[TimeSheetLine]"""
+        response = self.api_server.iter_get(path="Document_ТабельУчетаРабочегоВремени", auth=auth)
+        return (TimeSheetLine.init_from_dict(x) for y in response for x in y["ДанныеОВремени"])
+
+    def iter_time_sheets(self, auth) -> Iterator[TimeSheet]:
+        """Iterate over all time sheet documents for the given account. Documents are parsed
+        while the response is being received, so the whole response is not kept in memory
+
+        Parameters
+        ----------
+        auth: (str, str)
+            1C basic auth
+
+        Returns
+        -------
+        Iterator[TimeSheet]"""
+        response = self.api_server.iter_get(path="Document_ТабельУчетаРабочегоВремени", auth=auth)
+        return (TimeSheet.init_from_dict(x) for x in response)
+
     def add_time_sheet(self, auth, time_sheet: TimeSheet):
     #ToDo apply single get for TimeSheet with the new TimeSheet generated Ref_Key (obj_id)
         """
@@ -358,6 +414,30 @@ class API1C:
         )
         return True #TimeSheet.init_from_dict(result) - now result has no Ref_Key for TimeSheetLines.
 
+    def add_time_sheets(self, auth, time_sheets: List[TimeSheet]):
+        """Post several time sheet documents at once, requests are sent concurrently
+
+        Parameters
+        ----------
+        auth: (str, str)
+            1C basic auth
+        time_sheets: List[TimeSheet]
+            the documents Time Sheet to add to 1C
+
+        Returns
+        -------
+        List[bool]
+            One result per added time sheet
+
+        """
+        results = self.api_server.bulk_post(
+            path="Document_ТабельУчетаРабочегоВремени",
+            auth=auth,
+            data_list=[{k: v for k, v in time_sheet.to_dict().items() if k != "Ref_Key"}
+                       for time_sheet in time_sheets],
+        )
+        return [True] * len(results)  # see add_time_sheet
+
 
 '''    def get_user(self, api_key):
         """Get the user for the given api key
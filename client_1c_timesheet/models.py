@@ -3,9 +3,10 @@ Models as simply as possible, omitting any fields not used by this package
 TODO complete class and methods documentation
 """
 
-from typing import Type, List
+import weakref
+from typing import List
 from abc import ABC, abstractmethod
-from datetime import datetime, date
+from datetime import datetime, date, timezone
 
 import dateutil
 import dateutil.parser as date_parser
@@ -32,21 +33,34 @@ class Client1CDatetime:
         if not datetime_in.tzinfo:
             datetime_in = datetime_in.replace(tzinfo=dateutil.tz.tzlocal())
         self.datetime = datetime_in
+        self._datetime_utc = None
+        self._datetime_local = None
 
     @property
     def datetime_utc(self):
         """This datetime in the UTC time zone"""
-        return self.datetime.astimezone(dateutil.tz.UTC)
+        if self._datetime_utc is None:
+            tzinfo = self.datetime.tzinfo
+            if tzinfo is dateutil.tz.UTC or tzinfo is timezone.utc:
+                self._datetime_utc = self.datetime
+            else:
+                self._datetime_utc = self.datetime.astimezone(dateutil.tz.UTC)
+        return self._datetime_utc
 
     @property
     def datetime_local(self):
         """This datetime as local time"""
-        return self.datetime.astimezone(dateutil.tz.tzlocal())
+        if self._datetime_local is None:
+            if isinstance(self.datetime.tzinfo, dateutil.tz.tzlocal):
+                self._datetime_local = self.datetime
+            else:
+                self._datetime_local = self.datetime.astimezone(dateutil.tz.tzlocal())
+        return self._datetime_local
 
     @property
     def clockify_datetime(self):
         """This datetime a clockify-format string"""
-        return self.datetime_utc.strftime(self.clockify_datetime_format)
+        return self.datetime_utc.strftime(self.datetime_format)
 
     @classmethod
     def init_from_string(cls, clockify_date_string):
@@ -55,9 +69,47 @@ class Client1CDatetime:
     def __str__(self):
         return self.clockify_datetime
 
+
+def _parse_datetime(date_str: str) -> datetime:
+    """Parse ISO 8601 string as sent by API quickly, fall back to dateutil for anything else"""
+    try:
+        return datetime.fromisoformat(date_str.replace('Z', '+00:00'))
+    except ValueError:
+        return date_parser.parse(date_str)
+
+
+def _compile_init_from_dict(cls):
+    """Generate init_from_dict for cls with literal keys, from declarative class attributes
+
+    _fields maps __init__ parameters to dict keys, _ref_fields does the same for keys holding a reference
+    (shared APIObjectID) and _source_fields maps parameters to python expressions over dict_in
+    """
+    args = [f"{name}=dict_in[{key!r}]" for name, key in cls._fields.items()]
+    args += [f"{name}=_intern_object_id(dict_in[{key!r}])" for name, key in cls._ref_fields.items()]
+    args += [f"{name}={source}" for name, source in cls._source_fields.items()]
+    source = ("def init_from_dict(cls, dict_in):\n"
+              "    try:\n"
+              f"        return cls({', '.join(args)})\n"
+              "    except KeyError as e:\n"
+              "        raise ObjectParseException(f\"Could not find key '{e.args[0]}' in '{dict_in}'\")\n")
+    namespace = {}
+    exec(source, globals(), namespace)
+    return classmethod(namespace['init_from_dict'])
+
+
 class APIObject(ABC):
     """A root for objects that is used in the 1C API (odata.metadata) and its children
     can be intiated from API response"""
+    __slots__ = ()
+    # subclasses declaring any of these get a generated init_from_dict, see _compile_init_from_dict
+    _fields = {}
+    _ref_fields = {}
+    _source_fields = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if any(attr in cls.__dict__ for attr in ('_fields', '_ref_fields', '_source_fields')):
+            cls.init_from_dict = _compile_init_from_dict(cls)
 
     def __str__(self):
         return f"{self.__class__.__name__} "
@@ -127,10 +179,13 @@ class APIObject(ABC):
         if not date_str:
             return None
         try:
-            return ClockifyDatetime.init_from_string(date_str).datetime
+            datetime_out = _parse_datetime(date_str)
         except ValueError as e:
             msg = f"Error parsing {date_str} to datetime: '{e}'"
             raise ObjectParseException(msg)
+        if not datetime_out.tzinfo:
+            datetime_out = datetime_out.replace(tzinfo=dateutil.tz.tzlocal())
+        return datetime_out
 
     @classmethod
     @abstractmethod
@@ -163,6 +218,9 @@ class APIObject(ABC):
 
 class APIObjectID(APIObject):
     """An object that can be returned by the clockify API, has its ID, one level above json dicts."""
+    __slots__ = ('_obj_id', '__weakref__')
+    _fields = {'obj_id': 'Ref_Key'}
+
     def __init__(self, obj_id):
         """
         Parameters
@@ -170,7 +228,12 @@ class APIObjectID(APIObject):
         obj_id: str
             object id hash
         """
-        self.obj_id = obj_id
+        self._obj_id = obj_id
+
+    @property
+    def obj_id(self):
+        """Read only, it is the hash of the object. To refer to another object assign a new APIObjectID"""
+        return self._obj_id
 
 
     def __eq__(self, other):
@@ -180,30 +243,27 @@ class APIObjectID(APIObject):
         ----------
         other: None or APIObjectID
         """
-
-        if other:
-            return self.obj_id == other.obj_id
-        else:
+        if other is None:
             return False
+        if not isinstance(other, APIObjectID):
+            return NotImplemented
+        return self.obj_id == other.obj_id
 
     def __ne__(self, other):
         """
         Parameters
         ----------
         other: None or APIObjectID"""
-        return not self.__eq__(other)
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
 
     def __hash__(self):
         """using API hash stored in obj_id"""
-        return self.obj_id.__hash__()
+        return hash(self.obj_id)
 
     def __str__(self):
         return super().__str__() + f"({self.obj_id}) "
 
-    @classmethod
-    def init_from_dict(cls, dict_in) -> Type[APIObject]:
-        return cls(obj_id=cls.get_item(dict_in=dict_in, key='Ref_Key'))
-
     def to_dict(self):
         """As dict that can be sent to API"""
         return {"Ref_Key": self.obj_id}
@@ -211,6 +271,9 @@ class APIObjectID(APIObject):
 
 class NamedAPIObject(APIObjectID):
     """An object of clockify API, with name and ID"""
+    __slots__ = ('name',)
+    _fields = {'obj_id': 'Ref_Key', 'name': 'Description'}
+
     def __init__(self, obj_id, name):
         """
         Parameters
@@ -226,77 +289,118 @@ class NamedAPIObject(APIObjectID):
     def __str__(self):
         return super().__str__() + f"'{self.name}' "
 
-    @classmethod
-    def init_from_dict(cls, dict_in):
-        return cls(obj_id=cls.get_item(dict_in=dict_in, key='Ref_Key'),
-            name=cls.get_item(dict_in=dict_in, key='Description'))
-
     def to_dict(self):
-        return super().to_dict() | {"Description": self.name}
+        as_dict = super().to_dict()
+        as_dict["Description"] = self.name
+        return as_dict
 
 
 class TimeGroup(NamedAPIObject):
+    __slots__ = ('letter', 'digit')
+    _fields = {'obj_id': 'Ref_Key', 'name': 'Description', 'letter': 'БуквенныйКод', 'digit': 'ЦифровойКод'}
+
     def __init__(self, obj_id, name: str, letter: str, digit: str):
         super().__init__(obj_id=obj_id, name=name)
         self.letter = letter
         self.digit = digit
 
-    @classmethod
-    def init_from_dict(cls, dict_in):
-        return cls(obj_id=cls.get_item(dict_in=dict_in, key='Ref_Key'),
-                   name=cls.get_item(dict_in=dict_in, key='Description'),
-                   letter=cls.get_item(dict_in=dict_in, key='БуквенныйКод'),
-                   digit=cls.get_item(dict_in=dict_in, key='ЦифровойКод'),
-                   )
-
     def to_dict(self):
-        as_dict = super().to_dict() | {'БуквенныйКод': self.letter, 'ЦифровойКод': self.digit}
-        return {x: y for x, y in as_dict.items() if y}  # remove items with None value
+        # items with None value are not sent
+        as_dict = {'Ref_Key': self.obj_id} if self.obj_id else {}
+        if self.name:
+            as_dict['Description'] = self.name
+        if self.letter:
+            as_dict['БуквенныйКод'] = self.letter
+        if self.digit:
+            as_dict['ЦифровойКод'] = self.digit
+        return as_dict
 
 
 class Organization(NamedAPIObject):
-    pass
+    __slots__ = ()
 
 
 class Person(NamedAPIObject):
-    pass
+    __slots__ = ()
 
 
 class Employee(NamedAPIObject):
+    __slots__ = ('person', 'organization')
+    _ref_fields = {'person': 'ФизическоеЛицо_Key', 'organization': 'ГоловнаяОрганизация_Key'}
+
     def __init__(self, obj_id, name: str, person: APIObjectID, organization: APIObjectID):
         super().__init__(obj_id=obj_id, name=name)
         self.person = person
         self.organization = organization
 
-    @classmethod
-    def init_from_dict(cls, dict_in):
-        return cls(obj_id=cls.get_item(dict_in=dict_in, key='Ref_Key'),
-                   name=cls.get_item(dict_in=dict_in, key='Description'),
-                   person=APIObjectID(cls.get_item(dict_in=dict_in, key='ФизическоеЛицо_Key')),
-                   organization=APIObjectID(cls.get_item(dict_in=dict_in, key='ГоловнаяОрганизация_Key')),
-                   )
-
     def to_dict(self):
-        as_dict = super().to_dict() | \
-                  {"ФизическоеЛицо_Key": self.person.obj_id, "ГоловнаяОрганизация_Key": self.organization.obj_id}
-        return {x: y for x, y in as_dict.items() if y}  # remove items with None value
+        # items with None value are not sent
+        as_dict = {'Ref_Key': self.obj_id} if self.obj_id else {}
+        if self.name:
+            as_dict['Description'] = self.name
+        if self.person.obj_id:
+            as_dict["ФизическоеЛицо_Key"] = self.person.obj_id
+        if self.organization.obj_id:
+            as_dict["ГоловнаяОрганизация_Key"] = self.organization.obj_id
+        return as_dict
+
+
+_object_ids = weakref.WeakValueDictionary()
+
+
+def _intern_object_id(obj_id) -> APIObjectID:
+    """Shared APIObjectID for obj_id. Safe to share as obj_id is read only
+
+    References repeat a lot in time sheet lines (time groups, territories), so one instance per obj_id
+    is kept while it is in use
+    """
+    api_obj_id = _object_ids.get(obj_id)
+    if api_obj_id is None:
+        api_obj_id = APIObjectID(obj_id)
+        _object_ids[obj_id] = api_obj_id
+    return api_obj_id
+
+
+# keys of the day fields of a time sheet line in 1C, index is day - 1
+_HOURS_KEYS = tuple(f'Часов{day}' for day in range(1, 32))
+_TIME_GROUP_KEYS = tuple(f'ВидВремени{day}_Key' for day in range(1, 32))
+_TERRITORY_KEYS = tuple(f'Территория{day}_Key' for day in range(1, 32))
+_WORKING_CONDITIONS_KEYS = tuple(f'УсловияТруда{day}_Key' for day in range(1, 32))
+_WORK_SHIFT_KEYS = tuple(f'ПереходящаяЧастьСмены{day}' for day in range(1, 32))
 
 
 class TimeSheetRecord:
+    __slots__ = ('day', 'hours', 'time_group', 'territory', 'working_conditions', 'work_shift')
+
     def __init__(self, day: int, hours: float, time_group: APIObjectID, territory: APIObjectID,
                  working_conditions: APIObjectID, work_shift: bool):
         self.day = day
-        self._hours = int(hours*10)
+        self.hours = int(hours*10)/10  # 1C keeps hours with one decimal, truncated once here
         self.time_group = time_group
         self.territory = territory
         self.working_conditions = working_conditions
         self.work_shift = work_shift
 
     def get_hours(self):
-        return self._hours/10
+        return self.hours
+
+
+# 31 records of a time sheet line unrolled, used by the generated TimeSheetLine.init_from_dict
+_TIME_SHEET_RECORDS_SOURCE = '[' + ', '.join(
+    f"TimeSheetRecord(day={i + 1}, hours=dict_in[{_HOURS_KEYS[i]!r}], "
+    f"time_group=_intern_object_id(dict_in[{_TIME_GROUP_KEYS[i]!r}]), "
+    f"territory=_intern_object_id(dict_in[{_TERRITORY_KEYS[i]!r}]), "
+    f"working_conditions=_intern_object_id(dict_in[{_WORKING_CONDITIONS_KEYS[i]!r}]), "
+    f"work_shift=dict_in[{_WORK_SHIFT_KEYS[i]!r}])"
+    for i in range(31)) + ']'
 
 
 class TimeSheetLine(APIObjectID):
+    __slots__ = ('number', 'employee', 'time_sheet_records')
+    _fields = {'obj_id': 'Ref_Key', 'number': 'LineNumber'}
+    _ref_fields = {'employee': 'Сотрудник_Key'}
+    _source_fields = {'time_sheet_records': _TIME_SHEET_RECORDS_SOURCE}
+
     def __init__(self, obj_id, number: str, employee: APIObjectID, time_sheet_records: List[TimeSheetRecord]):
         """
         Parameters
@@ -315,36 +419,30 @@ class TimeSheetLine(APIObjectID):
         self.employee = employee
         self.time_sheet_records = time_sheet_records
 
-    @classmethod
-    def init_from_dict(cls, dict_in):
-        return cls(obj_id=cls.get_item(dict_in=dict_in, key='Ref_Key'),
-                   number=cls.get_item(dict_in=dict_in, key='LineNumber'),
-                   employee=APIObjectID(cls.get_item(dict_in=dict_in, key='Сотрудник_Key')),
-                   time_sheet_records=[TimeSheetRecord(
-                       day=day,
-                       hours=cls.get_item(dict_in=dict_in, key=f'Часов{day}'),
-                       time_group=APIObjectID(cls.get_item(dict_in=dict_in, key=f'ВидВремени{day}_Key')),
-                       territory=APIObjectID(cls.get_item(dict_in=dict_in, key=f'Территория{day}_Key')),
-                       working_conditions=APIObjectID(cls.get_item(dict_in=dict_in,
-                                                                   key=f'УсловияТруда{day}_Key')),
-                       work_shift=cls.get_item(dict_in=dict_in, key=f'ПереходящаяЧастьСмены{day}'))
-                       for day in range(1, 32)],
-                   )
-
     def to_dict(self):
-        tsr_dict = {tsr.day: tsr for tsr in self.time_sheet_records}
-        as_dict = super().to_dict() | \
-              {'LineNumber': self.number, 'Сотрудник_Key': self.employee.obj_id} | \
-              {f'Часов{day}': tsr.get_hours() for day, tsr in tsr_dict.items()} | \
-              {f'ВидВремени{day}_Key': tsr.time_group.obj_id for day, tsr in tsr_dict.items()} | \
-              {f'Территория{day}_Key': tsr.territory.obj_id for day, tsr in tsr_dict.items()} | \
-              {f'УсловияТруда{day}_Key': tsr.working_conditions.obj_id for day, tsr in tsr_dict.items()} | \
-              {f'ПереходящаяЧастьСмены{day}': tsr.work_shift for day, tsr in tsr_dict.items()}
+        as_dict = super().to_dict()
+        as_dict['LineNumber'] = self.number
+        as_dict['Сотрудник_Key'] = self.employee.obj_id
+        for tsr in self.time_sheet_records:
+            i = tsr.day - 1
+            as_dict[_HOURS_KEYS[i]] = tsr.hours
+            as_dict[_TIME_GROUP_KEYS[i]] = tsr.time_group.obj_id
+            as_dict[_TERRITORY_KEYS[i]] = tsr.territory.obj_id
+            as_dict[_WORKING_CONDITIONS_KEYS[i]] = tsr.working_conditions.obj_id
+            as_dict[_WORK_SHIFT_KEYS[i]] = tsr.work_shift
         return as_dict
         #        {x: y for x, y in as_dict.items() if y}  # remove items with None value
 
 
+def _date_to_str(value: date) -> str:
+    """Date as 1C datetime string at midnight, like '2021-06-01T00:00:00'"""
+    return date.isoformat(value) + 'T00:00:00'  # date.isoformat drops the time part of a datetime as well
+
+
 class TimeSheet(APIObjectID):
+    __slots__ = ('period', 'organization', 'date_start', 'date_end', 'time_sheet_lines', 'number',
+                 'datetime_stamp', 'orgunit')
+
     def __init__(self, obj_id,
                  period: date,
                  organization: APIObjectID,
@@ -391,10 +489,10 @@ class TimeSheet(APIObjectID):
     @classmethod
     def init_from_dict(cls, dict_in):
         return cls(obj_id=cls.get_item(dict_in=dict_in, key='Ref_Key'),
-                   period=datetime.fromisoformat(cls.get_item(dict_in=dict_in, key='ПериодРегистрации')).date(),
+                   period=date.fromisoformat(cls.get_item(dict_in=dict_in, key='ПериодРегистрации')[:10]),
                    organization=APIObjectID(cls.get_item(dict_in=dict_in, key='Организация_Key')),
-                   date_start=datetime.fromisoformat(cls.get_item(dict_in=dict_in, key='ДатаНачалаПериода')).date(),
-                   date_end=datetime.fromisoformat(cls.get_item(dict_in=dict_in, key='ДатаОкончанияПериода')).date(),
+                   date_start=date.fromisoformat(cls.get_item(dict_in=dict_in, key='ДатаНачалаПериода')[:10]),
+                   date_end=date.fromisoformat(cls.get_item(dict_in=dict_in, key='ДатаОкончанияПериода')[:10]),
                    time_sheet_lines=[TimeSheetLine.init_from_dict(dict_in=d) for d in dict_in['ДанныеОВремени']],
                    number=cls.get_item(dict_in=dict_in, key='Number'),
                    datetime_stamp=datetime.fromisoformat(cls.get_item(dict_in=dict_in, key='Date')),
@@ -402,21 +500,29 @@ class TimeSheet(APIObjectID):
                    )
 
     def to_dict(self):
-        date_start_str = datetime.combine(self.date_start, datetime.min.time()).isoformat() if self.date_start else None
-        date_end_str = datetime.combine(self.date_end, datetime.min.time()).isoformat() if self.date_end else None
-        datetime_stamp_str = self.datetime_stamp.isoformat() if self.datetime_stamp else None
-        period_str = datetime.combine(self.period, datetime.min.time()).isoformat() if self.period else None
-        orgunit_str = self.orgunit.obj_id if self.orgunit else None
-        as_dict = super().to_dict() | \
-                  {'Number': self.number, 'Date': datetime_stamp_str, "ПериодРегистрации": period_str,
-                   'Организация_Key': self.organization.obj_id, 'Подразделение_Key': orgunit_str,
-                   'ДатаНачалаПериода': date_start_str, 'ДатаОкончанияПериода': date_end_str,
-                   'ДанныеОВремени': [x.to_dict() for x in self.time_sheet_lines]
-                   }
-        return {x: y for x, y in as_dict.items() if y}  # remove items with None value
+        # items with None value are not sent
+        as_dict = super().to_dict() if self.obj_id else {}
+        if self.number:
+            as_dict['Number'] = self.number
+        if self.datetime_stamp:
+            as_dict['Date'] = self.datetime_stamp.isoformat()
+        if self.period:
+            as_dict["ПериодРегистрации"] = _date_to_str(self.period)
+        if self.organization.obj_id:
+            as_dict['Организация_Key'] = self.organization.obj_id
+        if self.orgunit and self.orgunit.obj_id:
+            as_dict['Подразделение_Key'] = self.orgunit.obj_id
+        if self.date_start:
+            as_dict['ДатаНачалаПериода'] = _date_to_str(self.date_start)
+        if self.date_end:
+            as_dict['ДатаОкончанияПериода'] = _date_to_str(self.date_end)
+        if self.time_sheet_lines:
+            as_dict['ДанныеОВремени'] = [x.to_dict() for x in self.time_sheet_lines]
+        return as_dict
 
 
 class TimeEntry(APIObjectID):
+    __slots__ = ('start', 'user', 'description', 'project', 'task', 'tags', 'end')
 
     def __init__(self, obj_id: str, start, user: str, description='', project=None, task=None, tags=None, end=None):
         """
@@ -447,6 +553,13 @@ class TimeEntry(APIObjectID):
     def __str__(self):
         return super().__str__() + f"- '{self.truncate(self.description)}'"
 
+    @staticmethod
+    def datetime_to_str(datetime_in: datetime) -> str:
+        """Datetime as API string, formatted directly if it is already in UTC"""
+        if datetime_in.tzinfo is not None and not datetime_in.utcoffset():
+            return datetime_in.strftime(Client1CDatetime.datetime_format)
+        return str(Client1CDatetime(datetime_in))
+
     @staticmethod
     def truncate(msg, length=30):
         if msg[length:]:
@@ -485,20 +598,22 @@ class TimeEntry(APIObjectID):
 
     def to_dict(self):
         """As dict that can be sent to API"""
-        as_dict = {"id": self.obj_id,
-                   "start": str(ClockifyDatetime(self.start)),
-                   "description": self.description,
-                   "userId": self.user.obj_id
-                   }
+        # items with None value are not sent
+        as_dict = {"id": self.obj_id} if self.obj_id else {}
+        as_dict["start"] = self.datetime_to_str(self.start)
+        if self.description:
+            as_dict["description"] = self.description
+        if self.user.obj_id:
+            as_dict["userId"] = self.user.obj_id
         if self.end:
-            as_dict["end"] = str(ClockifyDatetime(self.end))
-        if self.project:
+            as_dict["end"] = self.datetime_to_str(self.end)
+        if self.project and self.project.obj_id:
             as_dict["projectId"] = self.project.obj_id
-        if self.task:
+        if self.task and self.task.obj_id:
             as_dict["taskId"] = self.task.obj_id
         if self.tags:
             as_dict["tagIds"] = [t.obj_id for t in self.tags]
-        return {x: y for x, y in as_dict.items() if y}  # remove items with None value
+        return as_dict
 
 class ObjectParseException(Client1CException):
     pass
@@ -1 +1,50 @@
 """Unit test package for client_1c_timesheet."""
+
+import json
+from pathlib import Path
+
+# local folder with credentials for 1C server and test output, not in the repository
+CREDENTIALS_DIR = Path(__file__).resolve().parent.parent / 'credentials'
+CREDENTIALS_FILE = CREDENTIALS_DIR / '1c.json'
+
+try:
+    import orjson
+    loads_json = orjson.loads
+except ImportError:  # orjson is optional
+    loads_json = json.loads
+
+
+def dumps_json(data) -> bytes:
+    """Human readable utf-8 json of data. Always the standard library, so output files do not depend on orjson"""
+    return json.dumps(data, ensure_ascii=False, indent=4, separators=(',', ': ')).encode('utf-8')
+
+
+def load_json(path):
+    """Read and parse a json file. Wrap in a session scoped fixture to read it once per test run"""
+    with open(path, 'rb') as task:
+        return loads_json(task.read())
+
+
+EMPTY_KEY = '00000000-0000-0000-0000-000000000000'
+
+
+def time_sheet_line_dict(line_number: int) -> dict:
+    """A line of a 1C time sheet document as returned by the api: 8.3 hours every day but each 7th"""
+    line = {'Ref_Key': 'a5c1ad50-d3f8-11eb-8358-080027d91ffd', 'LineNumber': str(line_number),
+            'Сотрудник_Key': f'cb5e1b52-b4db-11eb-7297-000c298d5e5{line_number % 3}'}
+    for day in range(1, 32):
+        line[f'Часов{day}'] = 8.3 if day % 7 else 0
+        line[f'ВидВремени{day}_Key'] = 'b398cab2-6ae7-11eb-8358-080027d91ffd' if day % 7 else EMPTY_KEY
+        line[f'Территория{day}_Key'] = EMPTY_KEY
+        line[f'УсловияТруда{day}_Key'] = EMPTY_KEY
+        line[f'ПереходящаяЧастьСмены{day}'] = False
+    return line
+
+
+def time_sheet_dict(number_of_lines: int) -> dict:
+    """A 1C time sheet document as returned by the api"""
+    return {'Ref_Key': 'a5c1ad50-d3f8-11eb-8358-080027d91ffd', 'Number': '0000-000001',
+            'Date': '2021-06-23T12:00:00', 'ПериодРегистрации': '2021-06-01T00:00:00',
+            'Организация_Key': 'a2edb898-b4db-11eb-7297-000c298d5e5b', 'Подразделение_Key': EMPTY_KEY,
+            'ДатаНачалаПериода': '2021-06-01T00:00:00', 'ДатаОкончанияПериода': '2021-06-30T00:00:00',
+            'ДанныеОВремени': [time_sheet_line_dict(i) for i in range(1, number_of_lines + 1)]}
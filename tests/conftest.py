@@ -0,0 +1,162 @@
+"""Fixtures shared by all test modules."""
+import pytest
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from time import monotonic, sleep
+from urllib.parse import unquote, urlsplit
+from requests.utils import requote_uri
+from client_1c_timesheet.api import APIServer
+from client_1c_timesheet.client import API1C, APISession
+from tests import load_json, CREDENTIALS_FILE
+
+# without a credentials file the tests replay the recorded cassettes against this url
+PLACEHOLDER_CREDENTIALS = {'url': 'http://1c.example/odata/standard.odata/', 'user': 'user', 'password': 'password'}
+# response headers that identify the 1C server or its session, not stored in cassettes
+SCRUBBED_RESPONSE_HEADERS = ('set-cookie', 'server', 'date')
+
+
+@pytest.fixture(scope="session")
+def credentials():
+    if CREDENTIALS_FILE.exists():
+        return load_json(CREDENTIALS_FILE)
+    return dict(PLACEHOLDER_CREDENTIALS)
+
+
+@pytest.fixture(scope="module")
+def vcr_config(credentials):
+    """pytest-vcr: record the 1C traffic once, replay it on later runs, also without credentials.
+    Basic auth, cookies and the server url are not stored, so cassettes replay against any url"""
+    urls = {credentials['url'], requote_uri(credentials['url'])}
+    placeholder_url = PLACEHOLDER_CREDENTIALS['url']
+
+    def scrub_request(request):
+        for url in urls:
+            request.uri = request.uri.replace(url, placeholder_url)
+        return request
+
+    def scrub_response(response):
+        for header in [h for h in response['headers'] if h.lower() in SCRUBBED_RESPONSE_HEADERS]:
+            del response['headers'][header]
+        for url in urls:
+            response['body']['string'] = response['body']['string'].replace(url.encode('utf-8'),
+                                                                            placeholder_url.encode('utf-8'))
+        return response
+
+    return {'record_mode': 'once' if CREDENTIALS_FILE.exists() else 'none',
+            'match_on': ('method', 'path', 'query'),
+            'filter_headers': ['authorization'],
+            'before_record_request': scrub_request,
+            'before_record_response': scrub_response}
+
+
+@pytest.fixture(autouse=True)
+def _skip_vcr_without_cassette(request):
+    """Without credentials vcr tests can only replay, skip the ones that have no cassette recorded"""
+    if CREDENTIALS_FILE.exists() or not request.node.get_closest_marker('vcr'):
+        return
+    cassette_name = request.getfixturevalue('vcr_cassette_name')
+    cassette = Path(request.getfixturevalue('vcr_cassette_dir')) / f'{cassette_name}.yaml'
+    if not cassette.exists():
+        pytest.skip(f'no credentials in {CREDENTIALS_FILE} to record {cassette.name}')
+
+
+@pytest.fixture(scope="session")
+def a_server(credentials):
+    with APIServer(credentials['url']) as server:  # one keep-alive http session for all tests
+        yield server
+
+
+@pytest.fixture(scope="session")
+def an_api(a_server):
+    return API1C(api_server=a_server)
+
+
+@pytest.fixture(scope="session")
+def an_api_session(credentials, a_server):
+    return APISession(a_server, (credentials['user'], credentials['password']))
+
+
+@pytest.fixture
+def a_new_api_session(credentials, a_server):
+    """An APISession with empty caches, for tests which have to make all their requests themselves"""
+    return APISession(a_server, (credentials['user'], credentials['password']))
+
+
+class LocalServer(ThreadingHTTPServer):
+    """Stand-in for the 1C OData server on localhost. Answers each path with the reply set by reply()
+    and logs every request it receives. Unknown paths get an odata 404 error"""
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), _LocalHandler)
+        self.url = f'http://127.0.0.1:{self.server_address[1]}/'
+        self.replies = {}
+        self.requests = []
+        self._log_lock = threading.Lock()
+
+    def reply(self, path, body: bytes, status=200, delay=0.0, chunk_size=None):
+        """Answer requests to path with body. If chunk_size is set, send it chunked in pieces of that size"""
+        self.replies[path] = (status, body, delay, chunk_size)
+
+    def log(self, request):
+        with self._log_lock:
+            self.requests.append(request)
+
+
+class LocalRequest:
+    """A request as received by LocalServer"""
+
+    def __init__(self, method, path, headers, body):
+        self.received = monotonic()
+        self.method = method
+        self.path = path
+        self.headers = headers
+        self.body = body
+
+
+class _LocalHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    not_found = b'{"odata.error": {"code": 404, "message": {"lang": "ru", "value": "not found"}}}'
+
+    def do_GET(self):
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        path = unquote(urlsplit(self.path).path).lstrip('/')
+        self.server.log(LocalRequest(self.command, path, self.headers, body))
+        status, reply, delay, chunk_size = self.server.replies.get(path, (404, self.not_found, 0.0, None))
+        sleep(delay)
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json;charset=utf-8')
+        if chunk_size is None:
+            self.send_header('Content-Length', str(len(reply)))
+            self.end_headers()
+            self.wfile.write(reply)
+            return
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+        for i in range(0, len(reply), chunk_size):
+            chunk = reply[i:i + chunk_size]
+            self.wfile.write(b'%x\r\n%s\r\n' % (len(chunk), chunk))
+            self.wfile.flush()
+        self.wfile.write(b'0\r\n\r\n')
+
+    do_POST = do_PUT = do_PATCH = do_GET
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def a_local_server():
+    server = LocalServer()
+    thread = threading.Thread(target=server.serve_forever, kwargs={'poll_interval': 0.05}, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def a_local_api_server(a_local_server):
+    with APIServer(a_local_server.url) as server:
+        yield server
@@ -0,0 +1,138 @@
+"""Offline tests for `client_1c_timesheet.api`, against a local stand-in for the 1C server."""
+import codecs
+import gc
+import json
+import threading
+
+import pytest
+
+from client_1c_timesheet import api
+from client_1c_timesheet.api import APIServer, APIServerException, APIServer404, APIResponseParseException
+
+AUTH = ('user', 'password')
+
+
+def odata_value(items) -> bytes:
+    return json.dumps({'odata.metadata': 'http://localhost/$metadata', 'value': items}).encode('utf-8')
+
+
+def test_bulk_get_keeps_order(a_local_server, a_local_api_server):
+    for i in range(5):
+        # the first requests are answered last
+        a_local_server.reply(f'Catalog_{i}', odata_value([{'Ref_Key': str(i)}]), delay=0.1 * (5 - i))
+    results = a_local_api_server.bulk_get([(f'Catalog_{i}', None) for i in range(5)], auth=AUTH)
+    assert [result[0]['Ref_Key'] for result in results] == ['0', '1', '2', '3', '4']
+
+
+def test_bulk_get_keeps_rate_limit(a_local_server, a_local_api_server):
+    a_local_server.reply('Catalog_Организации', odata_value([]))
+    count = 15
+    a_local_api_server.bulk_get([('Catalog_Организации', None)] * count, auth=AUTH)
+    received = sorted(request.received for request in a_local_server.requests)
+    assert len(received) == count
+    min_span = (count - 1) / APIServer.RATE_LIMIT_REQUESTS_PER_SECOND
+    assert received[-1] - received[0] >= min_span * 0.9
+
+
+def test_bulk_get_raises_api_errors(a_local_server, a_local_api_server):
+    a_local_server.reply('Catalog_Организации', odata_value([]))
+    a_local_server.reply('Catalog_Сотрудники',
+                         b'{"odata.error": {"code": 14, "message": {"lang": "ru", "value": "error"}}}', status=500)
+    with pytest.raises(APIServer404):
+        a_local_api_server.bulk_get([('Catalog_Организации', None), ('Catalog_Missing', None)], auth=AUTH)
+    with pytest.raises(APIServerException):
+        a_local_api_server.bulk_get([('Catalog_Сотрудники', None)], auth=AUTH)
+
+
+def test_bulk_post_sends_every_body(a_local_server, a_local_api_server):
+    a_local_server.reply('Document_ТабельУчетаРабочегоВремени', b'{"Ref_Key": "new"}', status=201)
+    data_list = [{'Number': str(i)} for i in range(5)]
+    data_list[2] = a_local_api_server.encode_json(data_list[2])  # already encoded bodies are sent as is
+    results = a_local_api_server.bulk_post('Document_ТабельУчетаРабочегоВремени', auth=AUTH, data_list=data_list)
+    assert results == [{'Ref_Key': 'new'}] * 5
+    sent = sorted(json.loads(request.body)['Number'] for request in a_local_server.requests)
+    assert sent == ['0', '1', '2', '3', '4']
+
+
+@pytest.fixture(params=['ijson', 'no ijson'])
+def iter_get_backend(request, monkeypatch):
+    """Run iter_get tests streaming with ijson and with the fallback that reads the whole response"""
+    if request.param == 'ijson':
+        pytest.importorskip('ijson')
+    else:
+        monkeypatch.setattr(api, 'ijson', None)
+    return request.param
+
+
+def test_iter_get(a_local_server, a_local_api_server, iter_get_backend):
+    items = [{'Ref_Key': str(i), 'Часов1': 8.3, 'Description': 'Рабочее время ' * 10} for i in range(1000)]
+    a_local_server.reply('Document_ТабельУчетаРабочегоВремени', odata_value(items), chunk_size=1000)
+    assert list(a_local_api_server.iter_get('Document_ТабельУчетаРабочегоВремени', auth=AUTH)) == items
+
+
+def test_iter_get_strips_bom(a_local_server, a_local_api_server, iter_get_backend):
+    items = [{'Ref_Key': '1'}, {'Ref_Key': '2'}]
+    a_local_server.reply('Catalog_Организации', codecs.BOM_UTF8 + odata_value(items))
+    assert list(a_local_api_server.iter_get('Catalog_Организации', auth=AUTH)) == items
+
+
+def test_iter_get_without_value(a_local_server, a_local_api_server, iter_get_backend):
+    a_local_server.reply('Catalog_Организации', b'{"odata.metadata": "http://localhost/$metadata"}')
+    assert list(a_local_api_server.iter_get('Catalog_Организации', auth=AUTH)) == []
+
+
+def test_iter_get_raises_api_errors(a_local_server, a_local_api_server, iter_get_backend):
+    with pytest.raises(APIServer404):
+        list(a_local_api_server.iter_get('Catalog_Missing', auth=AUTH))
+
+
+def test_iter_get_raises_on_truncated_json(a_local_server, a_local_api_server, iter_get_backend):
+    body = odata_value([{'Ref_Key': str(i)} for i in range(100)])
+    a_local_server.reply('Catalog_Организации', body[:len(body) // 2], chunk_size=100)
+    with pytest.raises(APIResponseParseException):
+        list(a_local_api_server.iter_get('Catalog_Организации', auth=AUTH))
+
+
+def test_iter_get_releases_unconsumed_connections(a_local_server, a_local_api_server, iter_get_backend):
+    items = [{'Ref_Key': str(i)} for i in range(1000)]
+    a_local_server.reply('Catalog_Организации', odata_value(items), chunk_size=1000)
+    results = []
+
+    def drop_iterators_then_get():
+        # more than the connection pool holds
+        iterators = [a_local_api_server.iter_get('Catalog_Организации', auth=AUTH)
+                     for _ in range(APIServer.RATE_LIMIT_REQUESTS_PER_SECOND * 3)]
+        for iterator in iterators[::2]:
+            next(iterator)  # partially consumed, the others are never started
+        del iterators, iterator
+        gc.collect()
+        results.append(a_local_api_server.get('Catalog_Организации', auth=AUTH))
+
+    thread = threading.Thread(target=drop_iterators_then_get, daemon=True)  # daemon: a hang does not block exit
+    thread.start()
+    thread.join(timeout=10)
+    assert not thread.is_alive(), 'connections of dropped iterators were not returned to the pool'
+    assert len(results[0]) == 1000
+
+
+def test_content_type_only_with_body(a_local_server, a_local_api_server):
+    a_local_server.reply('Catalog_Организации', odata_value([]))
+    a_local_server.reply('Document_ТабельУчетаРабочегоВремени', b'{"Ref_Key": "new"}', status=201)
+    a_local_api_server.get('Catalog_Организации', auth=AUTH)
+    a_local_api_server.post('Document_ТабельУчетаРабочегоВремени', auth=AUTH, data={'Number': '1'})
+    get_request, post_request = a_local_server.requests
+    assert get_request.headers['Accept'] == 'application/json'
+    assert 'Content-Type' not in get_request.headers
+    assert post_request.headers['Content-Type'] == 'application/json'
+
+
+@pytest.mark.parametrize('loads', ['default', 'json'])
+def test_get_raises_on_invalid_json(a_local_server, a_local_api_server, monkeypatch, loads):
+    if loads == 'json':
+        monkeypatch.setattr(api, '_loads', json.loads)  # the fallback without orjson
+    a_local_server.reply('Catalog_Организации', b'{"value": [')
+    a_local_server.reply('Catalog_Сотрудники', b'\xff{"value": []}')
+    with pytest.raises(APIResponseParseException):
+        a_local_api_server.get('Catalog_Организации', auth=AUTH)
+    with pytest.raises(APIResponseParseException):
+        a_local_api_server.get('Catalog_Сотрудники', auth=AUTH)
@@ -1,78 +1,89 @@
-import pytest
-import os
 import json
-from client_1c_timesheet.api import APIServer, APIServerException, APIErrorResponse
-from client_1c_timesheet.client import API1C, APISession
-
-@pytest.fixture()
-def credentials():
-    CREDENTIALS_FILE = os.path.abspath('../credentials/1c.json')
-    with open(CREDENTIALS_FILE, 'r', encoding='utf-8') as task:
-        setup_dict = json.load(task)
-    return setup_dict
-
-@pytest.fixture()
-def a_server(credentials):
-    return APIServer(credentials['url'])
-
-@pytest.fixture()
-def an_api(a_server):
-    return API1C(api_server=a_server)
+import pytest
+from client_1c_timesheet.client import APISession
+from client_1c_timesheet.models import TimeSheet
+from tests import dumps_json, CREDENTIALS_DIR, CREDENTIALS_FILE, time_sheet_dict
 
-@pytest.fixture()
-def an_api_session(credentials, a_server):
-    return APISession(a_server, (credentials['user'], credentials['password']))
 
-def test_api_calls_get(an_api_session):
+@pytest.mark.vcr
+def test_get_time_groups(an_api_session):
     time_groups = an_api_session.get_time_groups()
     assert len(time_groups) == 40
     assert time_groups[0].name == 'Рабочее время'
     assert time_groups[1].digit == '01'
+
+
+@pytest.mark.vcr
+def test_get_organizations(an_api_session):
     organizations = an_api_session.get_organizations()
     assert len(organizations) == 2
     assert organizations[1].name == "АО ЧТЭ"
     assert organizations[1].to_dict()["Description"] == "АО ЧТЭ"
+
+
+@pytest.mark.vcr
+def test_get_employees(an_api_session):
     employees = an_api_session.get_employees()
     assert len(employees) == 3
     assert employees[1].name == "Боширов Сергей Сергеевич"
     assert employees[2].organization.obj_id == "a2edb898-b4db-11eb-7297-000c298d5e5b"
     assert employees[2].to_dict()['ГоловнаяОрганизация_Key'] == "a2edb898-b4db-11eb-7297-000c298d5e5b"
     assert employees[1].to_dict()['Description'] == "Боширов Сергей Сергеевич"
+
+
+@pytest.mark.vcr
+def test_get_time_sheet_lines(an_api_session):
     time_sheet_lines = an_api_session.get_time_sheet_lines()
     assert time_sheet_lines[0].number == '4'
     assert time_sheet_lines[6].time_sheet_records[0].get_hours() == 8.3
     assert time_sheet_lines[8].time_sheet_records[15].time_group.obj_id == "b398cab2-6ae7-11eb-8358-080027d91ffd"
-    writetoafile('../credentials/test_TimeSheetLine_json', time_sheet_lines[3].to_dict())
+    writetoafile(CREDENTIALS_DIR / 'test_TimeSheetLine_json', time_sheet_lines[3].to_dict())
+
+
+@pytest.mark.vcr
+def test_get_time_sheets(an_api_session):
     time_sheets = an_api_session.get_time_sheets()
     assert len(time_sheets) == 13
-    with open("../credentials/output_filename", 'w', encoding='utf-8') as outfile:
-        json.dump(time_sheets[1].to_dict(),
-                  outfile,
-                  ensure_ascii=False,
-                  sort_keys=False,
-                  indent=4,
-                  separators=(',', ': ')
-                  )
-
-    writetoafile('../credentials/test_TimeSheet_json', time_sheets[1].to_dict())
-    time_sheets[1].number = '0000-000045'
-    new_time_sheet = an_api_session.add_time_sheet(time_sheets[1])
-    with open("../credentials/new_time_sheet", 'w', encoding='utf-8') as outfile:
-        json.dump(new_time_sheet.to_dict(),
-                  outfile,
-                  ensure_ascii=False,
-                  sort_keys=False,
-                  indent=4,
-                  separators=(',', ': ')
-                  )
+    time_sheet_json = dumps_json(time_sheets[1].to_dict())  # encoded once for both files
+    writetoafile(CREDENTIALS_DIR / 'output_filename', time_sheet_json)
+    writetoafile(CREDENTIALS_DIR / 'test_TimeSheet_json', time_sheet_json)
+
+
+@pytest.mark.order(-1)  # it changes data on the server, so that the others do not see the new time sheet
+@pytest.mark.vcr
+def test_add_time_sheet(a_new_api_session):
+    time_sheet = a_new_api_session.get_time_sheets()[1]
+    time_sheet.number = '0000-000045'
+    assert a_new_api_session.add_time_sheet(time_sheet)
+    writetoafile(CREDENTIALS_DIR / 'new_time_sheet', time_sheet.to_dict())
+
+
+def test_add_time_sheets_offline(a_local_server, a_local_api_server):
+    a_local_server.reply('Document_ТабельУчетаРабочегоВремени', b'{"Ref_Key": "new"}', status=201)
+    api_session = APISession(a_local_api_server, ('user', 'password'))
+    time_sheets = [TimeSheet.init_from_dict(time_sheet_dict(number_of_lines=2)) for _ in range(3)]
+    assert api_session.add_time_sheets(time_sheets) == [True, True, True]
+    assert len(a_local_server.requests) == 3
+    for request in a_local_server.requests:
+        sent = json.loads(request.body)
+        assert 'Ref_Key' not in sent
+        assert len(sent['ДанныеОВремени']) == 2
+
 
 def writetoafile(fname, data):
-    with open(fname, 'w', encoding='utf-8') as fp:
-        json.dump(data,
-                  fp,
-                  ensure_ascii=False,
-                  sort_keys=False,
-                  indent=4,
-                  separators=(',', ': ')
-                  )
+    """Write data (or json bytes from dumps_json) to fname, leave the file untouched if its content would not change
+
+    Output goes next to the credentials, so nothing is written when cassettes are replayed without them
+    """
+    if not CREDENTIALS_FILE.exists():
+        return
+    payload = data if isinstance(data, bytes) else dumps_json(data)
+    try:
+        with open(fname, 'rb') as fp:
+            if fp.read() == payload:
+                return
+    except FileNotFoundError:
+        pass
+    with open(fname, 'wb') as fp:
+        fp.write(payload)
 
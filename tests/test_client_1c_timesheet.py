@@ -3,39 +3,12 @@
 """Tests for `client_1c_timesheet` package."""
 
 import pytest
-import json
-import os
 
-from client_1c_timesheet.api import APIServer
 
-
-@pytest.fixture
-def response():
-    """Sample pytest fixture.
-
-    See more at: http://doc.pytest.org/en/latest/fixture.html
-    """
-    # import requests
-    # return requests.get('https://github.com/audreyr/cookiecutter-pypackage')
-
-@pytest.fixture
-def credentials():
-    CREDENTIALS_FILE = os.path.abspath('../credentials/1c.json')
-    with open(CREDENTIALS_FILE, 'r', encoding='utf-8') as task:
-        setup_dict = json.load(task)
-    return setup_dict
-
-
-def test_content(response):
-    """Sample pytest test function with the pytest fixture as an argument."""
-    # from bs4 import BeautifulSoup
-    # assert 'GitHub' in BeautifulSoup(response.content).title.string
-
-
-def test_api(credentials):
-    url = credentials['url']
+@pytest.mark.vcr
+def test_api(credentials, a_server):
     auth = (credentials['user'], credentials['password'])
-    api = APIServer(url)
+    api = a_server
     path = "Catalog_Контрагенты"
     assert api.get(path, auth)[0]['Ref_Key'].endswith('080027d91ffd')
     data = {
@@ -0,0 +1,127 @@
+"""Tests for `client_1c_timesheet.models`: parsing from and converting to api dicts."""
+from datetime import datetime, timedelta, timezone
+
+import dateutil.tz
+import pytest
+
+from client_1c_timesheet.models import APIObjectID, Client1CDatetime, Employee, ObjectParseException, TimeEntry, \
+    TimeGroup, TimeSheetLine, TimeSheetRecord
+from tests import EMPTY_KEY, time_sheet_line_dict
+
+
+def test_time_group_init_from_dict():
+    dict_in = {'Ref_Key': 'b398cab2-6ae7-11eb-8358-080027d91ffd', 'Description': 'Рабочее время',
+               'БуквенныйКод': 'Я', 'ЦифровойКод': '01', 'DataVersion': 'AAAAAQAAAAA='}
+    expected = TimeGroup(obj_id='b398cab2-6ae7-11eb-8358-080027d91ffd', name='Рабочее время', letter='Я', digit='01')
+    parsed = TimeGroup.init_from_dict(dict_in)
+    assert type(parsed) is TimeGroup
+    assert (parsed.obj_id, parsed.name, parsed.letter, parsed.digit) == \
+           (expected.obj_id, expected.name, expected.letter, expected.digit)
+    assert parsed.to_dict() == expected.to_dict()
+
+
+def test_employee_init_from_dict():
+    dict_in = {'Ref_Key': 'cb5e1b52-b4db-11eb-7297-000c298d5e5b', 'Description': 'Боширов Сергей Сергеевич',
+               'ФизическоеЛицо_Key': 'cb5e1b51-b4db-11eb-7297-000c298d5e5b',
+               'ГоловнаяОрганизация_Key': 'a2edb898-b4db-11eb-7297-000c298d5e5b'}
+    expected = Employee(obj_id='cb5e1b52-b4db-11eb-7297-000c298d5e5b', name='Боширов Сергей Сергеевич',
+                        person=APIObjectID('cb5e1b51-b4db-11eb-7297-000c298d5e5b'),
+                        organization=APIObjectID('a2edb898-b4db-11eb-7297-000c298d5e5b'))
+    parsed = Employee.init_from_dict(dict_in)
+    assert type(parsed) is Employee
+    assert (parsed.obj_id, parsed.name, parsed.person, parsed.organization) == \
+           (expected.obj_id, expected.name, expected.person, expected.organization)
+    assert parsed.to_dict() == expected.to_dict()
+
+
+def test_time_sheet_line_init_from_dict():
+    dict_in = time_sheet_line_dict(line_number=4)
+    parsed = TimeSheetLine.init_from_dict(dict_in)
+    assert type(parsed) is TimeSheetLine
+    assert (parsed.obj_id, parsed.number, parsed.employee) == \
+           (dict_in['Ref_Key'], '4', APIObjectID(dict_in['Сотрудник_Key']))
+    assert len(parsed.time_sheet_records) == 31
+    for day, record in enumerate(parsed.time_sheet_records, start=1):
+        expected = TimeSheetRecord(day=day, hours=dict_in[f'Часов{day}'],
+                                   time_group=APIObjectID(dict_in[f'ВидВремени{day}_Key']),
+                                   territory=APIObjectID(EMPTY_KEY), working_conditions=APIObjectID(EMPTY_KEY),
+                                   work_shift=False)
+        assert type(record) is TimeSheetRecord
+        assert (record.day, record.hours, record.time_group, record.territory, record.working_conditions,
+                record.work_shift) == \
+               (expected.day, expected.hours, expected.time_group, expected.territory, expected.working_conditions,
+                expected.work_shift)
+    assert parsed.time_sheet_records[6].get_hours() == 0
+    assert parsed.time_sheet_records[7].get_hours() == 8.3
+    # references are shared between records
+    assert parsed.time_sheet_records[0].territory is parsed.time_sheet_records[1].working_conditions
+    assert parsed.to_dict() == dict_in
+
+
+@pytest.mark.parametrize('cls, dict_in, missing', [
+    (TimeGroup, {'Ref_Key': 'b398cab2', 'Description': 'Рабочее время', 'ЦифровойКод': '01'}, 'БуквенныйКод'),
+    (Employee, {'Ref_Key': 'cb5e1b52', 'Description': 'Боширов', 'ФизическоеЛицо_Key': 'cb5e1b51'},
+     'ГоловнаяОрганизация_Key'),
+    (TimeSheetLine, {k: v for k, v in time_sheet_line_dict(1).items() if k != 'Часов15'}, 'Часов15'),
+])
+def test_init_from_dict_missing_key(cls, dict_in, missing):
+    with pytest.raises(ObjectParseException) as exc_info:
+        cls.init_from_dict(dict_in)
+    assert str(exc_info.value) == f"Could not find key '{missing}' in '{dict_in}'"
+
+
+def test_shared_references_are_read_only():
+    dict_in = time_sheet_line_dict(line_number=1)
+    line = TimeSheetLine.init_from_dict(dict_in)
+    with pytest.raises(AttributeError):
+        line.time_sheet_records[0].time_group.obj_id = 'CHANGED'
+    line.time_sheet_records[0].time_group = APIObjectID('CHANGED')  # replacing a reference changes one record
+    assert line.time_sheet_records[1].time_group.obj_id == dict_in['ВидВремени2_Key']
+    parsed_again = TimeSheetLine.init_from_dict(dict_in)
+    assert parsed_again.time_sheet_records[0].time_group.obj_id == dict_in['ВидВремени1_Key']
+
+
+@pytest.mark.parametrize('date_str, offset_hours', [
+    ('2021-06-23T09:00:00Z', 0),
+    ('2021-06-23T12:00:00+03:00', 3),
+    ('23 June 2021 09:00 UTC', 0),  # not ISO, parsed by dateutil
+])
+def test_get_datetime(date_str, offset_hours):
+    parsed = TimeEntry.get_datetime(dict_in={'start': date_str}, key='start')
+    assert parsed == datetime(2021, 6, 23, 9, 0, tzinfo=timezone.utc)
+    assert parsed.utcoffset() == timedelta(hours=offset_hours)
+
+
+def test_get_datetime_naive_is_local():
+    parsed = TimeEntry.get_datetime(dict_in={'Date': '2021-06-23T12:00:00'}, key='Date')
+    assert isinstance(parsed.tzinfo, dateutil.tz.tzlocal)
+    assert parsed.replace(tzinfo=None) == datetime(2021, 6, 23, 12, 0)
+
+
+def test_get_datetime_errors():
+    assert TimeEntry.get_datetime(dict_in={}, key='end', raise_error=False) is None
+    with pytest.raises(ObjectParseException):
+        TimeEntry.get_datetime(dict_in={'end': 'not a date'}, key='end')
+
+
+def test_client_1c_datetime():
+    utc = datetime(2021, 6, 23, 9, 0, tzinfo=dateutil.tz.UTC)
+    assert Client1CDatetime(utc).datetime_utc is utc
+    local = datetime(2021, 6, 23, 12, 0, tzinfo=dateutil.tz.tzlocal())
+    assert Client1CDatetime(local).datetime_local is local
+    moscow = Client1CDatetime(datetime(2021, 6, 23, 12, 0, tzinfo=timezone(timedelta(hours=3))))
+    assert moscow.datetime_utc == utc
+    assert moscow.datetime_local == utc
+    assert str(moscow) == '2021-06-23T09:00:00Z'
+    naive = Client1CDatetime(datetime(2021, 6, 23, 12, 0))
+    assert naive.datetime_local.replace(tzinfo=None) == datetime(2021, 6, 23, 12, 0)
+
+
+def test_time_entry_to_dict():
+    time_entry = TimeEntry(obj_id='e1', start=datetime(2021, 6, 23, 9, 0, tzinfo=timezone.utc),
+                           user=APIObjectID('u1'), description='Табель',
+                           end=datetime(2021, 6, 23, 12, 30, tzinfo=timezone(timedelta(hours=3))))
+    assert time_entry.to_dict() == {'id': 'e1', 'start': '2021-06-23T09:00:00Z', 'description': 'Табель',
+                                    'userId': 'u1', 'end': '2021-06-23T09:30:00Z'}
+    timer = TimeEntry(obj_id=None, start=datetime(2021, 6, 23, 9, 0, tzinfo=dateutil.tz.UTC), user=APIObjectID(None))
+    assert timer.to_dict() == {'start': '2021-06-23T09:00:00Z'}